@@ -1,8 +1,9 @@
 
 import asyncio
 import os
-# import signal
-from functools import partial
+import signal
+
+import uvloop
 
 from . import (
     api,
@@ -20,7 +21,7 @@ __version__ = "0.1.0"
 
 
 # quit_event = asyncio.Event()
-# STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
 app_state: state.State
 
 
@@ -36,6 +37,7 @@ async def main():
         os.environ["VERBOSE_LOGS"] = "1"
 
     log_utils.init()
+    api.setup_app()
 
     curr_names = tuple(currency.get_currency_types().keys())
     # Set requested "default" values
@@ -51,11 +53,12 @@ async def main():
     )
 
     # Define our tasks
-    api_server_task = asyncio.create_task(api.start_server(), name="api_server")
+    api_server = api.build_uvicorn_server()
+    api_server_task = asyncio.create_task(api.start_server(api_server), name="api_server")
     rates_fetcher_task = asyncio.create_task(
         fetcher.start_currency_fetcher(
             fetcher.URL_CBR_XML_DAILY,
-            fetcher.DataScheme_CBRXMLDaily,
+            fetcher.filter_data_CBRXMLDaily,
             args.period
         ),
         name="rates_fetcher"
@@ -69,22 +72,41 @@ async def main():
     )
 
     # Set exit callback
-    def exit_callback(tasks_to_cancel):
-        for task in tasks_to_cancel:
+    def exit_callback():
+        # Let the api server shut down gracefully, the rest can be just cancelled
+        api_server.should_exit = True
+        for task in tasks[1:]:
             task.cancel()
-    api.add_quit_callback(
-        partial(exit_callback, tasks[1:])
-    )
+
+    loop = asyncio.get_running_loop()
+    for sig in STOP_SIGNALS:
+        loop.add_signal_handler(sig, exit_callback)
 
     # Start
     log_utils.logger.info("SERVICE STARTING")
     try:
-        await asyncio.gather(*tasks)
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        # One of the tasks failed, the rest can't work w/o it
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        # Propagate the failure (if any)
+        for task in done:
+            task.result()
 
     except asyncio.CancelledError:
         # This is expected on exit
         pass
 
     finally:
+        for sig in STOP_SIGNALS:
+            loop.remove_signal_handler(sig)
+
         log_utils.logger.info("SERVICE STOPPING")
         log_utils.shutdown()
+
+def run():
+    """
+    Runs the service using uvloop, blocks until it stops
+    """
+    uvloop.run(main())
@@ -2,10 +2,8 @@
 Entry point
 """
 
-import asyncio
-
 import app
 
 
 if __name__ == "__main__":
-    asyncio.run(app.main())
+    app.run()
@@ -11,7 +11,7 @@ from . import (
 )
 from .application import (
     # app,
-    add_quit_callback
+    setup_app
 )
 
 from .. import log_utils
@@ -22,11 +22,16 @@ from .. import log_utils
 def build_uvicorn_server(host="0.0.0.0", port=8080) -> uvicorn.Server:
     """
     Builds an ASGI server
+    NOTE: the server runs in-process next to the other app tasks,
+        so there's always a single worker
     """
     cfg = uvicorn.Config(
         application.app,
         host=host,
         port=port,
+        loop="uvloop",
+        http="httptools",
+        backlog=2048,
         log_level=log_utils.get_lib_log_level()
     )
     return uvicorn.Server(cfg)
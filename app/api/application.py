@@ -2,8 +2,6 @@
 Modules implements base API backend
 """
 
-from typing import Callable
-
 import fastapi
 
 from . import endpoints
@@ -14,11 +12,10 @@ app = fastapi.FastAPI()
 
 app.include_router(endpoints.router)
 
-app.add_middleware(log_utils.ContentLoggerMiddleware)
-
 
-def add_quit_callback(fn: Callable):
+def setup_app():
     """
-    Adds quit callback to run on shutdown
+    Finishes the app setup that depends on the runtime config,
+    must be called after logging was initialised
     """
-    app.add_event_handler("shutdown", fn)
+    log_utils.install_content_logger(app)
@@ -4,6 +4,9 @@ Modules defines API endpoints
 The paths are required by the specification, no questions
 """
 
+from decimal import Decimal
+from collections.abc import Iterator
+
 import fastapi
 from fastapi import (
     responses,
@@ -18,16 +21,36 @@ from .. import (
 from . import models
 
 
-router = fastapi.APIRouter(
-    dependencies=[fastapi.Depends(log_utils.log_request_content)]
-)
+router = fastapi.APIRouter(route_class=log_utils.RequestLoggerRoute)
+
+# Maps payload field names onto currency names
+_FIELD_TO_CURRENCY = {
+    name: name.upper()
+    for name in models.CurrencyChangeModel.model_fields
+}
+
+
+def _iter_payload(data) -> Iterator[tuple[str, Decimal]]:
+    """
+    Yields (currency_name, value) pairs for the values set in a payload
+    """
+    fields_set = data.model_fields_set
+    for field, currency_name in _FIELD_TO_CURRENCY.items():
+        if field not in fields_set:
+            continue
+
+        value = getattr(data, field)
+        if value is None:
+            continue
+
+        yield currency_name, value
 
 
 @router.get("/amount/get", response_model=None, response_class=responses.PlainTextResponse)
 async def get_amount():
-    return await app.app_state.generate_report()
+    return responses.PlainTextResponse(await app.app_state.generate_report())
 
-@router.get("/{id}/get")
+@router.get("/{id}/get", response_model=models.CurrencyValueModel)
 async def get_currency(id: str):
     currency_name = id.upper()
     try:
@@ -40,16 +63,12 @@ async def get_currency(id: str):
             detail=f"Failed to process currency '{id}': {e}"
         )
 
-    return {"name": currency_name, "value": value}
+    return models.CurrencyValueModel(name=currency_name, value=value)
 
 @router.post("/amount/set", status_code=status.HTTP_204_NO_CONTENT)
 async def post_amount(data: models.CurrencyChangeModel):# type: ignore
     try:
-        for k, v in data.dict().items():# type: ignore
-            if v is None:
-                continue
-
-            k = k.upper()
+        for k, v in _iter_payload(data):
             await app.app_state.set_balance(k, v)
 
     except currency.CurrencyError as e:
@@ -64,12 +83,7 @@ async def post_amount(data: models.CurrencyChangeModel):# type: ignore
 @router.post("/modify", status_code=status.HTTP_204_NO_CONTENT)
 async def post_modify(data: models.CurrencyChangeModel):# type: ignore
     try:
-        for k, v in data.dict().items():# type: ignore
-            if v is None:
-                continue
-
-            k = k.upper()
-
+        for k, v in _iter_payload(data):
             if v < currency.MIN_AMOUNT:
                 await app.app_state.remove_balance(k, abs(v))
 
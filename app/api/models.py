@@ -1,6 +1,7 @@
 
 from decimal import Decimal
 import pydantic
+from fastapi import encoders
 
 
 from .. import currency
@@ -12,7 +13,17 @@ from .. import currency
 CurrencyChangeModel = pydantic.create_model(# type: ignore
     "CurrencyChangeModel",
     **{
-        name.lower(): (Decimal, None)
+        name.lower(): (Decimal|None, None)
         for name in currency.get_currency_types().keys()
     }
 )
+
+# Describes a model for a currency balance response
+class CurrencyValueModel(pydantic.BaseModel):
+    name: str
+    value: Decimal
+
+    @pydantic.field_serializer("value", when_used="json")
+    def _serialize_value(self, value: Decimal) -> int|float:
+        # Keep the value a JSON number, the same way jsonable_encoder does
+        return encoders.decimal_encoder(value)
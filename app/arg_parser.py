@@ -9,27 +9,34 @@ from . import currency
 
 
 # TODO: Doing str.lower would be much better UX
-TRUE_VALUES = frozenset(("1", "true", "True", "y", "Y"))
-FALSE_VALUES = frozenset(("0", "false", "False", "n", "N"))
-ALL_VALUES = TRUE_VALUES | FALSE_VALUES
+_BOOL_MAP = {
+    "1": True,
+    "true": True,
+    "True": True,
+    "y": True,
+    "Y": True,
+    "0": False,
+    "false": False,
+    "False": False,
+    "n": False,
+    "N": False
+}
 
 
 def _get_bool_values() -> str:
-    return ", ".join(map(lambda s: f"'{s}'", ALL_VALUES))
+    return ", ".join(map(lambda s: f"'{s}'", _BOOL_MAP))
 
 def _parse_debug(value: str) -> bool:
-    if value in TRUE_VALUES:
-        return True
+    try:
+        return _BOOL_MAP[value]
 
-    if value in FALSE_VALUES:
-        return False
-
-    raise ValueError(
-        "Unknown value for the 'debug' parameter: '{}', supported values: {}".format(
-            value,
-            _get_bool_values()
-        )
-    )
+    except KeyError:
+        raise ValueError(
+            "Unknown value for the 'debug' parameter: '{}', supported values: {}".format(
+                value,
+                _get_bool_values()
+            )
+        ) from None
 
 def _parse_period(value: str) -> int:
     rv = int(value)
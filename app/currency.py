@@ -6,7 +6,13 @@ from __future__ import annotations
 
 
 import abc
-from decimal import Decimal
+from decimal import (
+    Decimal,
+    DecimalException,
+    Inexact,
+    Overflow,
+    localcontext
+)
 from typing import (
     TypeVar,
     ClassVar,
@@ -17,12 +23,17 @@ from types import MappingProxyType
 
 
 MIN_AMOUNT = Decimal("0.0")
+# Currencies are stored as integer amounts of minor units,
+# this is the number of decimal places those units represent
+MINOR_UNIT_PLACES = 8
 
 T = TypeVar("T", bound="BaseCurrency")
 U = TypeVar("U", bound="BaseCurrency")
 # Number: TypeAlias = Decimal | int | str | float
 
 _currency_type_map: dict[str, type["BaseCurrency"]] = {}
+# Read-only live view, no need to recreate it on each call
+_currency_type_map_view = MappingProxyType(_currency_type_map)
 
 
 class CurrencyError(Exception):
@@ -61,24 +72,73 @@ class MissingExchangeRate(UnknownCurrency):
     """
 
 
+def _to_minor_units(value: Decimal) -> int:
+    """
+    Converts a decimal amount into minor units
+    """
+    if not value.is_finite():
+        raise InvalidCurrencyValue(f"'value' must be a finite number, got {value}")
+
+    # NOTE: the conversion must be exact, give the context enough precision
+    # and trap Inexact so nothing gets silently rounded
+    with localcontext() as ctx:
+        ctx.prec = max(ctx.prec, len(value.as_tuple().digits))
+        ctx.traps[Inexact] = True
+        try:
+            units = value.scaleb(MINOR_UNIT_PLACES).to_integral_exact()
+
+        except Overflow as e:
+            # NOTE: a subclass of Inexact, must go first
+            raise InvalidCurrencyValue(f"'value' is out of range, got {value}") from e
+
+        except Inexact:
+            raise InvalidCurrencyValue(
+                f"'value' can't have more than {MINOR_UNIT_PLACES} decimal places, got {value}"
+            ) from None
+
+        except DecimalException as e:
+            raise InvalidCurrencyValue(f"'value' is invalid, got {value}") from e
+
+    return int(units)
+
+def _from_minor_units(units: int) -> Decimal:
+    """
+    Converts minor units into a decimal amount
+    """
+    value = Decimal(units)
+    # NOTE: +1 for the digit quantize() may add
+    with localcontext() as ctx:
+        ctx.prec = max(ctx.prec, len(value.as_tuple().digits) + 1)
+        ctx.traps[Inexact] = True
+        value = value.scaleb(-MINOR_UNIT_PLACES).normalize()
+        # Don't let normalize() turn integers into the exponent notation
+        if value.as_tuple().exponent > MIN_AMOUNT.as_tuple().exponent:
+            value = value.quantize(MIN_AMOUNT)
+
+    return value
+
+
 @functools.total_ordering
 class BaseCurrency(abc.ABC):
     """
     ABC for currency classes
+    NOTE: the value is kept as an integer amount of minor units,
+        Decimal is only used at the boundaries
     """
     __NAME: ClassVar[str]
 
-    __slots__ = ("__value",)
+    __slots__ = ("__units",)
 
     def __init__(self, value: Decimal = MIN_AMOUNT) -> None:
         if not isinstance(value, Decimal):
             # value = Decimal(value)
             raise InvalidCurrencyValue("'value' must be an instance of 'Decimal'")
 
-        if value < MIN_AMOUNT:
+        units = _to_minor_units(value)
+        if units < 0:
             raise InvalidCurrencyValue(f"'value' must be >= 0.0, got {value}")
 
-        self.__value = value
+        self.__units = units
 
     def __repr__(self) -> str:
         return f"<Currency('{self.get_name()}', {self.get_value()})>"
@@ -102,6 +162,15 @@ class BaseCurrency(abc.ABC):
         cls.__NAME = name
         _currency_type_map[name] = cls
 
+    @classmethod
+    def _from_units(cls: type[T], units: int) -> T:
+        """
+        Alternative constructor from minor units, skips validation
+        """
+        rv = cls.__new__(cls)
+        rv.__units = units
+        return rv
+
     @classmethod
     def get_type(cls: type[T]) -> type[T]:
         """
@@ -120,7 +189,7 @@ class BaseCurrency(abc.ABC):
         """
         Returns this currency's value
         """
-        return self.__value
+        return _from_minor_units(self.__units)
 
     def get_current_hash(self) -> int:
         """
@@ -128,39 +197,39 @@ class BaseCurrency(abc.ABC):
         it can change over time and thus be used to compare if the object
         has changed over time
         """
-        return hash((self.get_type(), self.get_name(), self.get_value()))
+        return hash((self.get_type(), self.get_name(), self.__units))
 
     def __eq__(self, other) -> bool:
         cls = type(self)
         if isinstance(other, cls):
-            return self.get_value() == other.get_value()
+            return self.__units == other.__units
 
         return NotImplemented
 
     def __lt__(self, other) -> bool:
         cls = type(self)
         if isinstance(other, cls):
-            return self.get_value() < other.get_value()
+            return self.__units < other.__units
 
         return NotImplemented
 
     def __le__(self, other) -> bool:
         cls = type(self)
         if isinstance(other, cls):
-            return self.get_value() <= other.get_value()
+            return self.__units <= other.__units
 
         return NotImplemented
 
     def __add__(self: T, other) -> T:
         cls = type(self)
         if isinstance(other, cls):
-            return cls(value=self.get_value() + other.get_value())
+            return cls._from_units(self.__units + other.__units)
 
         return NotImplemented
 
     def __iadd__(self: T, other) -> T:
         if isinstance(other, type(self)):
-            self.__value += other.get_value()
+            self.__units += other.__units
             return self
 
         return NotImplemented
@@ -168,24 +237,24 @@ class BaseCurrency(abc.ABC):
     def __sub__(self: T, other) -> T:
         cls = type(self)
         if isinstance(other, cls):
-            new_value = self.get_value() - other.get_value()
-            if new_value < MIN_AMOUNT:
+            new_units = self.__units - other.__units
+            if new_units < 0:
                 raise InvalidCurrencyOperation(
                     "Subtrahend currency cannot be bigger than minuend currency"
                 )
 
-            return cls(value=new_value)
+            return cls._from_units(new_units)
 
         return NotImplemented
 
     def __isub__(self: T, other) -> T:
         if isinstance(other, type(self)):
-            if self.get_value() < other.get_value():
+            if self.__units < other.__units:
                 raise InvalidCurrencyOperation(
                     "Subtrahend currency cannot be bigger than minuend currency"
                 )
 
-            self.__value -= other.get_value()
+            self.__units -= other.__units
             return self
 
         return NotImplemented
@@ -201,7 +270,7 @@ def get_currency_types():
     """
     Returns read-only mapping over currency types
     """
-    return MappingProxyType(_currency_type_map)
+    return _currency_type_map_view
 
 
 class CurrencyManager():
@@ -298,21 +367,38 @@ class CurrencyManager():
         curr_type = curr.get_type()
         self._set_currency(curr_type(value))
 
+    def set_balance_multi(self, data: dict[str, Decimal]):
+        """
+        Sets balance for multiple currencies
+        """
+        for currency_name, value in data.items():
+            self.set_balance(currency_name, value)
+
+    def add_balance_multi(self, data: dict[str, Decimal]):
+        """
+        Adds to balance of multiple currencies
+        """
+        for currency_name, value in data.items():
+            self.add_balance(currency_name, value)
+
+    def remove_balance_multi(self, data: dict[str, Decimal]):
+        """
+        Removes from balance of multiple currencies
+        """
+        for currency_name, value in data.items():
+            self.remove_balance(currency_name, value)
+
     def get_current_hash(self) -> int:
         """
         Returns current hash of this object,
         NOT to be used as a key for hashsets/hashmaps
         """
-        # Preserve order
-        currency_hashes = sorted(
-            (
-                (name, curr.get_current_hash())
-                for name, curr
-                in self.__currencies.items()
-            ),
-            key=lambda i: i[0]
-        )
-        return hash(tuple(currency_hashes))
+        # XOR is commutative, so the order doesn't matter
+        rv = 0
+        for name, curr in self.__currencies.items():
+            rv ^= hash((name, curr.get_current_hash()))
+
+        return rv
 
 
 class CurrencyExchanger():
@@ -321,6 +407,7 @@ class CurrencyExchanger():
     """
     __slots__ = (
         "__rates",
+        "__cross_rates",
         "__base_currency"
     )
 
@@ -338,6 +425,8 @@ class CurrencyExchanger():
             )
 
         self.__rates: dict[str, Decimal] = {}
+        # Precomputed {(in_curr_name, out_curr_name): rate}
+        self.__cross_rates: dict[tuple[str, str], Decimal] = {}
         self.__base_currency = base_currency_name
         self.set_rate(base_currency_name, Decimal("1.0"))
 
@@ -347,21 +436,41 @@ class CurrencyExchanger():
             self.__rates
         )
 
-    def set_rate(self, currency_name: str, rate: Decimal):
-        """
-        Adds exchange rate to this exchanger
-        """
+    def _set_rate(self, currency_name: str, rate: Decimal):
         if rate <= MIN_AMOUNT:
             raise InvalidExchangeRate(f"Exchange rate must be greater than 0, got {rate}")
 
         self.__rates[currency_name] = rate
 
+    def _rebuild_cross_rates(self):
+        """
+        Recalculates exchange rates for every pair of currencies
+        """
+        rates = self.__rates
+        self.__cross_rates = {
+            (in_curr_name, out_curr_name): in_rate / out_rate
+            for in_curr_name, in_rate in rates.items()
+            for out_curr_name, out_rate in rates.items()
+        }
+
+    def set_rate(self, currency_name: str, rate: Decimal):
+        """
+        Adds exchange rate to this exchanger
+        """
+        self._set_rate(currency_name, rate)
+        self._rebuild_cross_rates()
+
     def set_rates(self, data: dict[str, Decimal]):
         """
         Adds multiple exchange rates for different currencies
         """
-        for curr_name, rate in data.items():
-            self.set_rate(curr_name, rate)
+        try:
+            for curr_name, rate in data.items():
+                self._set_rate(curr_name, rate)
+
+        finally:
+            # Some rates may have been set even on error
+            self._rebuild_cross_rates()
 
     def get_rate(self, currency_name: str) -> Decimal|None:
         """
@@ -384,7 +493,18 @@ class CurrencyExchanger():
         Returns exchange rate when converting in_curr_name into out_curr_name
         This will raise exceptions on error
         """
-        return self.get_rate_unsafe(in_curr_name) / self.get_rate_unsafe(out_curr_name)
+        if (rate := self.__cross_rates.get((in_curr_name, out_curr_name), None)) is None:
+            # This will raise for the missing rate
+            return self.get_rate_unsafe(in_curr_name) / self.get_rate_unsafe(out_curr_name)
+
+        return rate
+
+    def get_cross_rates(self) -> MappingProxyType[tuple[str, str], Decimal]:
+        """
+        Returns read-only mapping {(in_curr_name, out_curr_name): rate}
+        with exchange rates for every pair of known currencies
+        """
+        return MappingProxyType(self.__cross_rates)
 
     def get_all_cross_rate(self) -> dict[tuple[str, str], Decimal]:
         """
@@ -407,15 +527,12 @@ class CurrencyExchanger():
         NOT to be used as a key for hashsets/hashmaps as
         this object is MUTABLE
         """
-        # Always sort to prevent hash change due to ordering
-        rates = sorted(
-            (
-                (k, v)
-                for k, v in self.__rates.items()
-            ),
-            key=lambda i: i[0]
-        )
-        return hash(tuple(rates))
+        # XOR is commutative, so the order doesn't matter
+        rv = 0
+        for item in self.__rates.items():
+            rv ^= hash(item)
+
+        return rv
 
     def exchange(self, in_curr_name: str, value: Decimal, out_curr_name: str) -> Decimal:
         """
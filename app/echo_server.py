@@ -10,15 +10,19 @@ from . import log_utils
 
 async def start_server(period: int):
     """
-    Starts a coro that prints currency reports to stdout every period minutes
+    Starts a coro that prints currency reports to stdout on changes,
+    at most once every period minutes
     """
     period = period * 60
     last_hash = app.app_state.get_current_hash()
     while True:
+        await app.app_state.wait_for_change()
+        # Let the changes settle down
+        await asyncio.sleep(period)
+
+        # The changes could've been reverted or been no-op
         new_hash = app.app_state.get_current_hash()
         if last_hash != new_hash:
             last_hash = new_hash
             report = await app.app_state.generate_report()
-            log_utils.logger.info(f"Currency report:\n{report}")
-
-        await asyncio.sleep(period)
+            log_utils.logger.info("Currency report:\n%s", report)
@@ -3,14 +3,13 @@ Module that implements data fetcher
 """
 
 import asyncio
-import datetime
 from decimal import Decimal
 from json import JSONDecodeError
-from typing import TypeVar
+from typing import Callable
 from collections.abc import AsyncIterator
 
 import aiohttp
-import pydantic
+import orjson
 
 import app
 from . import (
@@ -19,97 +18,78 @@ from . import (
 )
 
 
-V = TypeVar("V", bound=pydantic.BaseModel)# pylint: disable=no-member
-
 URL_CBR_XML_DAILY = "https://www.cbr-xml-daily.ru/daily_json.js"
 
 
-class _ValuteItemScheme_CBRXMLDaily(pydantic.BaseModel):# pylint: disable=no-member
-    ID: str
-    NumCode: str
-    CharCode: str
-    Nominal: Decimal
-    Name: str
-    Value: Decimal
-    Previous: Decimal
-
-class DataScheme_CBRXMLDaily(pydantic.BaseModel):# pylint: disable=no-member
-    Date: datetime.datetime
-    PreviousDate: datetime.datetime
-    PreviousURL: str
-    Timestamp: datetime.datetime
-    Valute: dict[str, _ValuteItemScheme_CBRXMLDaily]
-
-
 async def _fetch(url: str, period: int, timeout: int) -> AsyncIterator[dict]:
     """
     Continuously fetches json data from the given url every period seconds
     """
+    # Keep the connection alive between fetches so we don't redo the handshakes
+    connector = aiohttp.TCPConnector(
+        limit=1,
+        keepalive_timeout=period + timeout,
+        ttl_dns_cache=3600
+    )
     timeout = aiohttp.ClientTimeout(timeout)# type: ignore
-    async with aiohttp.ClientSession(timeout=timeout) as sesh:
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={"Accept-Encoding": "gzip, deflate"},
+        auto_decompress=True
+    ) as sesh:
         while True:
             async with sesh.get(url) as resp:
                 try:
-                    raw_data = await resp.json(content_type=None)
+                    raw_data = orjson.loads(await resp.read())
                     yield raw_data
 
                 except (
                     JSONDecodeError,
-                    aiohttp.ContentTypeError,
                     aiohttp.ServerTimeoutError
                 ) as e:
                     log_utils.logger.error(
-                        f"Failed to fetch data: {e}", exc_info=True
+                        "Failed to fetch data: %s", e, exc_info=True
                     )
 
             await asyncio.sleep(period)
 
-def _validate(raw_data: dict, scheme_type: type[V]) -> V|None:
+def filter_data_CBRXMLDaily(raw_data: dict) -> dict[str, Decimal]|None:
     """
-    Validates raw json vs Padantic schema, returns parsed model or None
+    Extracts exchange rates of the known currencies from cbr-xml-daily data,
+    returns None if the data is malformed
+    NOTE: we only need a few currencies, so instead of validating the whole
+        payload we just pick what we need
     """
     try:
-        data = scheme_type(**raw_data)
-
-    except pydantic.ValidationError as e:
-        log_utils.logger.error(
-            f"Failed to validate raw data to model '{scheme_type.__name__}': {e}"
-        )
+        valute = raw_data["Valute"]
+        return {
+            name: Decimal(str(valute[name]["Value"]))
+            for name in currency.get_currency_types()
+            if name in valute
+        }
+
+    except (LookupError, TypeError, ArithmeticError) as e:
+        log_utils.logger.error("Failed to parse raw data: %r", e)
         return None
 
-    return data
-
-def _filter_data(model) -> dict[str, Decimal]|None:
-    rv = {}
-    if isinstance(model, DataScheme_CBRXMLDaily):
-        for item in model.Valute.values():
-            if currency.get_currency_type(item.CharCode) is None:
-                continue
-
-            rv[item.CharCode] = Decimal(item.Value)
-
-        return rv
-
-    log_utils.logger.error(
-        "Filer function failed, unknown model type: '{}', model: {}".format(
-            type(model).__name__,
-            model
-        )
-    )
-    return None
-
 async def start_currency_fetcher(
     url: str,
-    scheme_type: type[V],
+    filter_data: Callable[[dict], dict[str, Decimal]|None],
     period: int,
     timeout: int = 30
 ):
     """
     Continuously fetches currency data and updates app state
+
+    IN:
+        url - the url to fetch the data from
+        filter_data - function to extract exchange rates from the fetched data
+        period - update interval in seconds
+        timeout - request timeout in seconds
     """
     async for raw_data in _fetch(url, period, timeout=timeout):
-        raw_model = _validate(raw_data, scheme_type)
-        data = _filter_data(raw_model)
+        data = filter_data(raw_data)
         if data:
-            await app.app_state.set_exchange_rates(**data)
+            await app.app_state.set_exchange_rates(data)
             log_utils.logger.info("Exchange rates were updated")
@@ -11,19 +11,39 @@ from typing import Callable
 from collections.abc import Awaitable
 
 import fastapi
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette import concurrency
+from fastapi import routing
+from starlette.datastructures import Address
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send
+)
 
 
 FMT = "[{asctime}] [{levelname}]: {message}"
 DATEFMT = "%Y-%m-%d %H:%M:%S"
+# Max number of records waiting to be written
+QUEUE_SIZE = 8192
+# Past this many waiting records only warnings and errors are queued
+QUEUE_DROP_THRESHOLD = QUEUE_SIZE * 4 // 5
+# Max number of records the listener takes from the queue at once
+BATCH_SIZE = 512
+
+# Max number of spare buffers for collecting responses bodies
+BUFFER_POOL_SIZE = 32
+# Max number of bytes of a request/response body to log
+LOG_BODY_LIMIT = 4096
 
 logger: logging.Logger
 listener: handlers.QueueListener
+# NOTE: read once on init, the env var is set after this module is imported
+_verbose = False
 
 
 def _should_log_extra() -> bool:
-    return bool(os.environ.get("VERBOSE_LOGS", False))
+    return _verbose
 
 def _get_app_log_level() -> int:
     if _should_log_extra():
@@ -37,22 +57,81 @@ def get_lib_log_level() -> int:
 
     return logging.WARNING
 
+class DroppingQueueHandler(handlers.QueueHandler):
+    """
+    Queue handler that drops records instead of blocking when the queue is full
+    and leaves formatting to the listener thread
+    NOTE: when the queue is almost full, less important records are dropped
+        to leave room for warnings and errors
+    """
+    def enqueue(self, record: logging.LogRecord):
+        if (
+            record.levelno < logging.WARNING
+            and self.queue.qsize() > QUEUE_DROP_THRESHOLD
+        ):
+            return
+
+        try:
+            self.queue.put_nowait(record)
+
+        except queue.Full:
+            pass
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # NOTE: the listener runs in the same process, so we can pass
+        # the record as is and let the listener's handlers format it
+        return record
+
+class BatchQueueListener(handlers.QueueListener):
+    """
+    Queue listener that drains all available records at once (up to BATCH_SIZE)
+    before handling them
+    """
+    def enqueue_sentinel(self):
+        # NOTE: the queue is bounded, unlike producers we must wait for space,
+        # otherwise stop() fails when the queue is full
+        self.queue.put(self._sentinel)
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.dequeue(False))
+
+                except queue.Empty:
+                    break
+
+            for record in batch:
+                if record is self._sentinel:
+                    if has_task_done:
+                        q.task_done()
+                    return
+
+                self.handle(record)
+                if has_task_done:
+                    q.task_done()
+
 def init():
     """
     Initialises logging system
     """
-    global logger, listener
+    global logger, listener, _verbose
+
+    _verbose = bool(os.environ.get("VERBOSE_LOGS", False))
 
     console_formatter = logging.Formatter(fmt=FMT, datefmt=DATEFMT, style="{")
     console_handler = logging.StreamHandler(stream=sys.stdout)
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(logging.DEBUG)
 
-    q = queue.Queue(-1)
-    q_handler = handlers.QueueHandler(q)
+    q = queue.Queue(QUEUE_SIZE)
+    q_handler = DroppingQueueHandler(q)
     q_handler.setLevel(logging.DEBUG)
 
-    listener = handlers.QueueListener(q, console_handler, respect_handler_level=True)
+    listener = BatchQueueListener(q, console_handler, respect_handler_level=True)
 
     logger = logging.getLogger("app")
     logger.setLevel(_get_app_log_level())
@@ -68,61 +147,127 @@ def shutdown():
     logging.shutdown()
 
 
+def _truncate_body(body: bytes|bytearray) -> bytes:
+    """
+    Returns a copy of the body cut down to LOG_BODY_LIMIT bytes for logging
+    """
+    if len(body) > LOG_BODY_LIMIT:
+        return bytes(body[:LOG_BODY_LIMIT]) + b"...<truncated>"
+
+    return bytes(body)
+
 async def log_request_content(request: fastapi.Request):
     """
-    Dependency function to use in Router to enable
-    logging request body
+    Logs request content
     """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+
     logger.debug(
-        "Request: {} | '{}' | '{}' | {!r}".format(
-            request.client,
-            request.method,
-            request.url,
-            await request.body()
-        )
+        "Request: %s | '%s' | '%s' | %r",
+        request.client,
+        request.method,
+        request.url,
+        # NOTE: the body is cached for the endpoint, so reading it fully
+        # costs nothing extra, but we don't want to log all of it
+        _truncate_body(await request.body())
     )
 
-async def log_response_content(request: fastapi.Request, response: fastapi.Response):
+_buffer_pool: queue.LifoQueue[bytearray] = queue.LifoQueue(BUFFER_POOL_SIZE)
+
+
+def _acquire_buffer() -> bytearray:
     """
-    Dependency function to use in Router to enable
-    logging response content
+    Returns an empty buffer from the pool, or a new one if the pool is empty
     """
-    content = []
-    async for chunk in response.body_iterator:# type: ignore
-        if not isinstance(chunk, bytes):
-            chunk = chunk.encode(response.charset)
-        content.append(chunk)
+    try:
+        return _buffer_pool.get_nowait()
 
-    logger.debug(
-        "Response: {} | {} | {!r}".format(
-            request.client,
-            response.status_code,
-            b"".join(content)
-        )
-    )
-    # HACK: we exhausted the iterator and have to "refresh" it
-    setattr(
-        response,
-        "body_iterator",
-        concurrency.iterate_in_threadpool(iter(content))
-    )
+    except queue.Empty:
+        return bytearray()
+
+def _release_buffer(buffer: bytearray):
+    """
+    Clears the buffer and returns it to the pool
+    """
+    del buffer[:]
+    try:
+        _buffer_pool.put_nowait(buffer)
+
+    except queue.Full:
+        pass
+
+class RequestLoggerRoute(routing.APIRoute):
+    """
+    Route class for logging requests contents in verbose mode
+    NOTE: unlike a router dependency this is just a level check
+        when the debug level is disabled
+    """
+    def get_route_handler(self) -> Callable[[fastapi.Request], Awaitable[fastapi.Response]]:
+        route_handler = super().get_route_handler()
+
+        async def logging_route_handler(request: fastapi.Request) -> fastapi.Response:
+            if logger.isEnabledFor(logging.DEBUG):
+                await log_request_content(request)
 
-class ContentLoggerMiddleware(BaseHTTPMiddleware):
+            return await route_handler(request)
+
+        return logging_route_handler
+
+class ContentLoggerMiddleware():
     """
-    Middleware for logging requests and responses contents
+    ASGI middleware for logging responses contents
+    NOTE: unlike BaseHTTPMiddleware this doesn't buffer the response,
+        the body is sent as is and we only keep a copy of it for the log
+    NOTE: requests contents are logged by RequestLoggerRoute
     """
-    async def dispatch(
-        self,
-        request: fastapi.Request,
-        call_next: Callable[[fastapi.Request], Awaitable[fastapi.Response]]
-    ) -> fastapi.Response:
-        # FIXME: See https://github.com/tiangolo/fastapi/issues/394
-        # and https://github.com/encode/starlette/issues/495
-        # on why this is impossible as of now
-        # await log_request_content(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.DEBUG):
+            await self.app(scope, receive, send)
+            return
+
+        status = None
+        content = _acquire_buffer()
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                # Other types (e.g. from pathsend) can't be logged
+                # NOTE: keep one extra byte to know if we need to truncate
+                if (
+                    isinstance(chunk, (bytes, bytearray))
+                    and (size_left := LOG_BODY_LIMIT + 1 - len(content)) > 0
+                ):
+                    content.extend(memoryview(chunk)[:size_left])
 
-        response = await call_next(request)
+            await send(message)
 
-        await log_response_content(request, response)
+        try:
+            await self.app(scope, receive, send_wrapper)
 
-        return response
+            client = scope.get("client")
+            logger.debug(
+                "Response: %s | %s | %r",
+                Address(*client) if client else None,
+                status,
+                # Copy, the buffer is going to be reused
+                _truncate_body(content)
+            )
+
+        finally:
+            _release_buffer(content)
+
+def install_content_logger(app: fastapi.FastAPI):
+    """
+    Adds the content logging middleware to the app in verbose mode
+    NOTE: must be called after init() and before the app is started
+    """
+    if _should_log_extra():
+        app.add_middleware(ContentLoggerMiddleware)
@@ -3,6 +3,7 @@ Module that implements app state
 """
 
 import asyncio
+import io
 from decimal import Decimal
 
 from app import log_utils
@@ -17,6 +18,8 @@ class State():
     Represents a state of this app
     ASYNC-SAFE (except few sync methods)
     THREAD-UNSAFE
+    NOTE: methods that do a single synchronous operation don't need the lock,
+        they can't be interrupted by other coroutines
     """
     def __init__(
         self,
@@ -31,8 +34,12 @@ class State():
             manager - manager for currency management
         """
         self._lock = asyncio.Lock()
+        # Set whenever the state is modified
+        self._change_event = asyncio.Event()
         self._exchanger = exchanger
         self._manager = manager
+        # (state hash, report) for the last generated report
+        self._report_cache: tuple[int, str]|None = None
 
     def __repr__(self) -> str:
         return "<State({}, {})>".format(
@@ -40,6 +47,13 @@ class State():
             self._manager
         )
 
+    async def wait_for_change(self):
+        """
+        Waits until the state is modified
+        """
+        await self._change_event.wait()
+        self._change_event.clear()
+
     def get_current_hash(self) -> int:
         """
         Method returns current hash of this mutable object,
@@ -53,68 +67,94 @@ class State():
         """
         Returns balance for the given currency type
         """
-        async with self._lock:
-            return self._manager.get_balance(currency_name)
+        return self._manager.get_balance(currency_name)
 
     async def get_all_balance(self) -> dict[str, Decimal]:
         """
         Returns a mapping with balance for each currency
         """
-        async with self._lock:
-            return self._manager.get_all_balance()
+        return self._manager.get_all_balance()
 
     async def set_balance(self, currency_name: str, value: Decimal):
         """
         Sets currency balance
         """
-        async with self._lock:
-            self._manager.set_balance(currency_name, value)
+        self._manager.set_balance(currency_name, value)
+        self._change_event.set()
 
     async def set_balance_multi(self, **data: Decimal):
         """
         Sets balance for multiple currencies
         """
         async with self._lock:
-            for currency_name, value in data.items():
-                self._manager.set_balance(currency_name, value)
+            try:
+                self._manager.set_balance_multi(data)
+
+            finally:
+                # NOTE: the update may be partially applied before failing
+                self._change_event.set()
 
     async def add_balance(self, currency_name: str, value: Decimal):
         """
         Adds to currency balance if it exists
         """
-        async with self._lock:
-            self._manager.add_balance(currency_name, value)
+        self._manager.add_balance(currency_name, value)
+        self._change_event.set()
 
     async def add_balance_multi(self, **data: Decimal):
         """
         Adds to balance of multiple currencies
         """
         async with self._lock:
-            for currency_name, value in data.items():
-                self._manager.add_balance(currency_name, value)
+            try:
+                self._manager.add_balance_multi(data)
+
+            finally:
+                # NOTE: the update may be partially applied before failing
+                self._change_event.set()
 
     async def remove_balance(self, currency_name: str, value: Decimal):
         """
         Removes currency balance if it exists
         """
-        async with self._lock:
-            self._manager.remove_balance(currency_name, value)
+        self._manager.remove_balance(currency_name, value)
+        self._change_event.set()
 
     async def remove_balance_multi(self, **data: Decimal):
         """
         Removes balance of multiple currencies
         """
         async with self._lock:
-            for currency_name, value in data.items():
-                self._manager.remove_balance(currency_name, value)
+            try:
+                self._manager.remove_balance_multi(data)
+
+            finally:
+                # NOTE: the update may be partially applied before failing
+                self._change_event.set()
 
-    async def set_exchange_rates(self, **data: Decimal):
+    async def set_exchange_rates(self, data: dict[str, Decimal]):
         """
-        Sets exchange rates
+        Sets exchange rates in one go
         """
-        async with self._lock:
+        try:
             self._exchanger.set_rates(data)
 
+        finally:
+            # NOTE: the rates may be partially applied before failing
+            self._change_event.set()
+
+    def calculate_exchange_sync(
+        self,
+        in_curr_name: str,
+        value: Decimal,
+        out_curr_name: str
+    ) -> Decimal:
+        """
+        Calculates exchange result and returns it
+        NOTE: this is a pure calculation, so it's safe to call synchronously
+        """
+        return self._exchanger.exchange(in_curr_name, value, out_curr_name)
+
     async def calculate_exchange(
         self,
         in_curr_name: str,
@@ -124,56 +164,71 @@ class State():
         """
         Calculates exchange result and returns it
         """
-        async with self._lock:
-            return self._exchanger.exchange(in_curr_name, value, out_curr_name)
+        return self.calculate_exchange_sync(in_curr_name, value, out_curr_name)
 
     def _generate_report(self) -> str:
         """
         Generates currency report as specified in the specifications
         """
-        strings = []
+        buffer = io.StringIO()
+        write = buffer.write
 
         balance_data = self._manager.get_all_balance()
+        # Names in the report are lowercase
+        lower_names = {k: k.lower() for k in balance_data}
         for k, v in balance_data.items():
-            strings.append(f"{k.lower()}: {v}\n")
+            write(f"{lower_names[k]}: {v}\n")
 
-        strings.append("\n")
+        write("\n")
 
         rates = self._exchanger.get_all_cross_rate()
         for k, v in rates.items():# type: ignore
-            strings.append(f"{k[0].lower()}-{k[1].lower()}: {v}\n")
+            write(f"{k[0].lower()}-{k[1].lower()}: {v}\n")
 
-        strings.append("\n")
+        write("\n")
 
-        strings.append("sum:")
+        write("sum:")
+        # Avoid attribute lookups in the loop
+        get_cross_rate = self._exchanger.get_cross_rates().get
+        log_error = log_utils.logger.error
         for i, (k, v) in enumerate(balance_data.items()):
             for kk, vv in balance_data.items():
                 if k == kk:
                     continue
 
-                try:
-                    v += self._exchanger.exchange(kk, vv, k)
-
-                except currency.MissingExchangeRate as e:
+                if (rate := get_cross_rate((kk, k), None)) is None:
                     # We don't want the report to fail, rather just ignore the data
                     # we can't generate
                     # The only way this can happen is if we have currency, but no exchange rate for it
                     # (e.g. the service for that failed to send it to us)
-                    log_utils.logger.error(
+                    log_error(
                         "Error while generating report, "
-                        f"perhaps currency exchange rates are incomplete: {e}"
+                        "perhaps currency exchange rates are incomplete: "
+                        "no exchange rate for '%s' to '%s'",
+                        kk,
+                        k
                     )
+                    continue
+
+                v += vv * rate
 
-            strings.append(f" {v} {k.lower()}")
+            write(f" {v} {lower_names[k]}")
 
             if i != len(balance_data)-1:
-                strings.append(" /")
+                write(" /")
 
-        return "".join(strings)
+        return buffer.getvalue()
 
     async def generate_report(self) -> str:
         """
         Generates currency report as specified in the specifications
+        NOTE: the report is cached until the state changes
         """
         async with self._lock:
-            return self._generate_report()
+            current_hash = self.get_current_hash()
+            if self._report_cache is not None and self._report_cache[0] == current_hash:
+                return self._report_cache[1]
+
+            report = self._generate_report()
+            self._report_cache = (current_hash, report)
+            return report